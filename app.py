@@ -1,26 +1,24 @@
 from flask import Flask, request, jsonify, send_file, render_template
 from flask_cors import CORS
+import io
 import os
 import json
+import time
 import uuid
 import logging
+import threading
 from datetime import datetime
 from werkzeug.utils import secure_filename
 
 # NLP Libraries
-from langdetect import detect, DetectorFactory
-from deep_translator import GoogleTranslator
 from gtts import gTTS
 
-# Document Processing Libraries
-from docx import Document
-from pdfminer.high_level import extract_text
-import PyPDF2
-from openpyxl import load_workbook
-from pptx import Presentation
-
-# Set seed for consistent language detection
-DetectorFactory.seed = 0
+from document_processing import (
+    allowed_file,
+    extract_text_from_stream,
+    detect_language_with_confidence,
+    translate_text_chunked,
+)
 
 app = Flask(__name__)
 CORS(app)
@@ -28,8 +26,10 @@ CORS(app)
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 AUDIO_FOLDER = 'audio'
-ALLOWED_EXTENSIONS = {'txt', 'pdf', 'docx', 'xlsx', 'pptx', 'doc'}
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
+FILE_MAX_AGE = 60 * 60  # Sweep files older than 1 hour
+FOLDER_MAX_BYTES = 256 * 1024 * 1024  # 256MB per folder
+SWEEP_INTERVAL = 5 * 60  # 5 minutes
 
 # Create directories
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -80,140 +80,59 @@ LANGUAGE_CODES = {
     'cy': 'Welsh'
 }
 
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+def sweep_folder(folder, max_age=FILE_MAX_AGE, max_bytes=FOLDER_MAX_BYTES):
+    """Remove stale files and keep the folder under max_bytes, oldest first"""
+    now = time.time()
+    entries = []
+    for entry in os.scandir(folder):
+        try:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            continue  # Removed by another request while scanning
+    
+    entries.sort()
+    total_bytes = sum(size for _, size, _ in entries)
+    removed = 0
+    
+    for mtime, size, path in entries:
+        if now - mtime < max_age and total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total_bytes -= size
+            removed += 1
+        except OSError as e:
+            logger.warning(f"Sweeper could not remove {path}: {e}")
+    
+    return removed
 
-def extract_text_from_file(file_path):
-    """Enhanced text extraction with better error handling"""
-    try:
-        file_extension = file_path.lower().split('.')[-1]
-        
-        if file_extension == 'pdf':
-            # Try pdfminer first, fallback to PyPDF2
+def sweep_storage():
+    """Background loop bounding disk usage of the upload and audio folders"""
+    while True:
+        for folder in (UPLOAD_FOLDER, AUDIO_FOLDER):
             try:
-                text = extract_text(file_path)
-                if not text.strip():
-                    with open(file_path, 'rb') as file:
-                        pdf_reader = PyPDF2.PdfReader(file)
-                        text = ""
-                        for page in pdf_reader.pages:
-                            text += page.extract_text()
-                return text
+                removed = sweep_folder(folder)
+                if removed:
+                    logger.info(f"Sweeper removed {removed} files from {folder}")
             except Exception as e:
-                logger.error(f"PDF extraction error: {e}")
-                return ""
-                
-        elif file_extension == 'docx':
-            doc = Document(file_path)
-            text = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
-            # Also extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += '\n' + cell.text
-            return text
-            
-        elif file_extension == 'xlsx':
-            workbook = load_workbook(file_path)
-            text = ""
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                for row in sheet.iter_rows(values_only=True):
-                    row_text = ' '.join([str(cell) for cell in row if cell is not None])
-                    if row_text.strip():
-                        text += row_text + '\n'
-            return text
-            
-        elif file_extension == 'pptx':
-            presentation = Presentation(file_path)
-            text = ""
-            for slide in presentation.slides:
-                for shape in slide.shapes:
-                    if hasattr(shape, "text"):
-                        text += shape.text + '\n'
-            return text
-            
-        elif file_extension == 'txt':
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        return f.read()
-                except UnicodeDecodeError:
-                    continue
-            return ""
-            
-        else:
-            return ""
-            
-    except Exception as e:
-        logger.error(f"Text extraction error for {file_path}: {e}")
-        return ""
+                logger.error(f"Sweeper error for {folder}: {e}")
+        time.sleep(SWEEP_INTERVAL)
 
-def detect_language_with_confidence(text):
-    """Enhanced language detection with confidence scoring"""
-    try:
-        if not text or len(text.strip()) < 10:
-            return 'en', 0.5
-            
-        # Clean text for better detection
-        clean_text = ' '.join(text.split()[:1000])  # Use first 1000 words
-        
-        detected_lang = detect(clean_text)
-        
-        # Simple confidence estimation based on text length and character patterns
-        confidence = min(0.9, 0.5 + (len(clean_text) / 1000) * 0.4)
-        
-        return detected_lang, confidence
-        
-    except Exception as e:
-        logger.error(f"Language detection error: {e}")
-        return 'en', 0.3
+_sweeper_started = False
+_sweeper_lock = threading.Lock()
 
-def translate_text_chunked(text, src_lang, dest_lang, max_chunk_size=4500):
-    """Translate text in chunks to handle large documents using deep-translator"""
-    try:
-        # Handle auto-detection
-        if src_lang == 'auto':
-            src_lang = detect(text)
-        
-        # Create translator instance
-        translator = GoogleTranslator(source=src_lang, target=dest_lang)
-        
-        if len(text) <= max_chunk_size:
-            return translator.translate(text)
-        
-        # Split text into chunks
-        chunks = []
-        sentences = text.split('. ')
-        current_chunk = ""
-        
-        for sentence in sentences:
-            if len(current_chunk + sentence) < max_chunk_size:
-                current_chunk += sentence + '. '
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + '. '
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        # Translate each chunk
-        translated_chunks = []
-        for chunk in chunks:
-            try:
-                translated_chunk = translator.translate(chunk)
-                translated_chunks.append(translated_chunk)
-            except Exception as e:
-                logger.error(f"Translation error for chunk: {e}")
-                translated_chunks.append(chunk)  # Keep original if translation fails
-        
-        return ' '.join(translated_chunks)
-        
-    except Exception as e:
-        logger.error(f"Translation error: {e}")
-        return f"Translation failed: {str(e)}. Original text: {text[:200]}..."
+@app.before_request
+def start_sweeper():
+    """Start the storage sweeper once the app is actually serving requests"""
+    global _sweeper_started
+    if _sweeper_started:
+        return
+    with _sweeper_lock:
+        if not _sweeper_started:
+            threading.Thread(target=sweep_storage, name='storage-sweeper', daemon=True).start()
+            _sweeper_started = True
 
 @app.route('/')
 def index():
@@ -238,15 +157,12 @@ def upload_file():
         if not allowed_file(file.filename):
             return jsonify({'error': 'File type not supported'}), 400
         
-        # Generate unique filename
-        file_id = str(uuid.uuid4())
         filename = secure_filename(file.filename)
-        file_path = os.path.join(UPLOAD_FOLDER, f"{file_id}_{filename}")
         
-        file.save(file_path)
-        
-        # Extract text
-        extracted_text = extract_text_from_file(file_path)
+        # Extract straight from Werkzeug's upload buffer, which is kept in
+        # memory for small files and cleaned up with the request otherwise
+        file.stream.seek(0)
+        extracted_text = extract_text_from_stream(file.stream, filename)
         
         if not extracted_text.strip():
             return jsonify({'error': 'No text could be extracted from the file'}), 400
@@ -254,9 +170,6 @@ def upload_file():
         # Detect language
         detected_lang, confidence = detect_language_with_confidence(extracted_text)
         
-        # Clean up uploaded file
-        os.remove(file_path)
-        
         return jsonify({
             'success': True,
             'text': extracted_text[:5000],  # Limit preview text
@@ -357,14 +270,10 @@ def download_text():
         if not text:
             return jsonify({'error': 'No text provided'}), 400
         
-        # Create temporary file
-        temp_id = str(uuid.uuid4())
-        temp_path = os.path.join(UPLOAD_FOLDER, f"temp_{temp_id}.txt")
-        
-        with open(temp_path, 'w', encoding='utf-8') as f:
-            f.write(text)
+        # Stream from memory so nothing is left behind on disk
+        buffer = io.BytesIO(text.encode('utf-8'))
         
-        return send_file(temp_path, as_attachment=True, download_name=filename)
+        return send_file(buffer, mimetype='text/plain', as_attachment=True, download_name=filename)
         
     except Exception as e:
         logger.error(f"Download error: {e}")
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Offline batch translator for NLP Document Translator
+
+Walks a directory tree (or a manifest listing one path per line), extracts
+text in a process pool, translates with bounded concurrency and writes one
+output file per document plus a JSONL report. Re-running with the same
+report and target language skips documents that already completed or had
+no extractable text; failed documents are retried.
+
+Usage:
+    python batch_translate.py <directory|manifest> -o <output_dir> -t es
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import importlib
+from concurrent.futures import (
+    ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+)
+from concurrent.futures.process import BrokenProcessPool
+
+from document_processing import (
+    allowed_file,
+    extract_text_from_file,
+    detect_language_with_confidence,
+    translate_text_chunked,
+)
+
+logger = logging.getLogger('batch_translate')
+
+
+class EchoTranslator:
+    """Local stand-in backend that returns the text unchanged"""
+
+    def __init__(self, source='auto', target='en'):
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        return text
+
+
+BACKENDS = {
+    'google': 'deep_translator:GoogleTranslator',
+    'echo': EchoTranslator,
+}
+
+
+def load_backend(spec):
+    """Resolve a backend name or a 'module:Class' path to a translator class"""
+    backend = BACKENDS.get(spec, spec)
+    if not isinstance(backend, str):
+        return backend
+
+    module_name, _, class_name = backend.partition(':')
+    if not module_name or not class_name:
+        raise ValueError(f"Backend must be one of {sorted(BACKENDS)} or 'module:Class', got '{spec}'")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def collect_sources(source, exclude_dir=None):
+    """Return (base_dir, paths) for a directory tree or a manifest file"""
+    if os.path.isdir(source):
+        base_dir = os.path.abspath(source)
+        paths = []
+        for root, dirs, files in os.walk(base_dir):
+            # Never pick up previous outputs when they live inside the source tree
+            dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != exclude_dir)
+            for name in sorted(files):
+                if allowed_file(name):
+                    paths.append(os.path.join(root, name))
+        return base_dir, paths
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            path = line if os.path.isabs(line) else os.path.join(base_dir, line)
+            if allowed_file(path):
+                paths.append(os.path.abspath(path))
+            else:
+                logger.warning(f"Skipping unsupported file: {line}")
+    return base_dir, paths
+
+
+def output_path_for(path, base_dir, output_dir, target_lang):
+    """Mirror the source layout under output_dir as '<name>.<lang>.txt'"""
+    rel_path = os.path.relpath(path, base_dir)
+    if rel_path.startswith(os.pardir):
+        # Manifest entries outside the manifest directory keep their full path
+        rel_path = os.path.splitdrive(path)[1].lstrip(os.sep)
+    return os.path.join(output_dir, f"{rel_path}.{target_lang}.txt")
+
+
+def load_completed(report_path, target_lang):
+    """Return the source paths the report marks as done for target_lang"""
+    completed = set()
+    if not os.path.exists(report_path):
+        return completed
+
+    with open(report_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Partial line from an interrupted run
+            if record.get('target_language') != target_lang:
+                continue
+            if record.get('status') == 'empty' or (
+                    record.get('status') == 'ok' and os.path.exists(record.get('output', ''))):
+                completed.add(record['source'])
+    return completed
+
+
+def translate_document(path, text, output_path, target_lang, translator_class):
+    """Detect, translate and write one document; returns a report record"""
+    started = time.time()
+    record = {
+        'source': path,
+        'output': output_path,
+        'target_language': target_lang,
+        'chars': len(text),
+        'words': len(text.split()),
+    }
+
+    detected_lang, confidence = detect_language_with_confidence(text)
+    record['detected_language'] = detected_lang
+    record['confidence'] = confidence
+
+    try:
+        # Strict mode so a rate-limited chunk fails the document instead of
+        # leaving untranslated text behind that resume would then skip
+        translated_text = translate_text_chunked(text, detected_lang, target_lang,
+                                                 translator_class=translator_class, strict=True)
+        if not translated_text:
+            raise ValueError('Empty translation')
+    except Exception as e:
+        logger.error(f"Translation error for {path}: {e}")
+        record['status'] = 'failed'
+        record['error'] = str(e)
+    else:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        temp_path = output_path + '.part'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(translated_text)
+        os.replace(temp_path, output_path)
+        record['status'] = 'ok'
+
+    record['seconds'] = round(time.time() - started, 3)
+    return record
+
+
+def log_progress(done, total, chars, started):
+    """Log completed count with file and character throughput"""
+    elapsed = max(time.time() - started, 1e-6)
+    logger.info(f"[{done}/{total}] {done / elapsed:.2f} files/s, {chars / elapsed:.0f} chars/s")
+
+
+def run_batch(source, output_dir, target_lang, translator_class, report_path=None,
+              workers=None, concurrency=4, resume=True):
+    """Translate every supported document under source; returns status counts"""
+    output_dir = os.path.abspath(output_dir)
+    base_dir, paths = collect_sources(source, exclude_dir=output_dir)
+    report_path = report_path or os.path.join(output_dir, 'report.jsonl')
+    os.makedirs(output_dir, exist_ok=True)
+
+    completed = load_completed(report_path, target_lang) if resume else set()
+    pending_paths = [path for path in paths if path not in completed]
+    logger.info(f"{len(paths)} documents found, {len(paths) - len(pending_paths)} already done for '{target_lang}'")
+
+    counts = {'ok': 0, 'empty': 0, 'failed': 0, 'unfinished': 0}
+    total = len(pending_paths)
+    done = 0
+    chars = 0
+    started = time.time()
+    last_logged = started
+
+    # Keep a bounded number of documents in flight so extracted text
+    # does not pile up in memory while translation catches up
+    window = max(concurrency, workers or os.cpu_count() or 1) * 2
+    queue = iter(pending_paths)
+    pool_broken = False
+
+    # langdetect loads its profiles lazily and is not safe to initialise from
+    # several threads at once, so load them here before translation starts
+    detect_language_with_confidence('Warm up the language detection profiles before translating.')
+
+    with ProcessPoolExecutor(max_workers=workers) as extract_pool, \
+            ThreadPoolExecutor(max_workers=concurrency) as translate_pool, \
+            open(report_path, 'a' if resume else 'w', encoding='utf-8') as report:
+
+        extracting = {}
+        translating = {}
+
+        while True:
+            while not pool_broken and len(extracting) + len(translating) < window:
+                path = next(queue, None)
+                if path is None:
+                    break
+                try:
+                    extracting[extract_pool.submit(extract_text_from_file, path, strict=True)] = path
+                except BrokenProcessPool:
+                    pool_broken = True
+
+            if not extracting and not translating:
+                break
+
+            finished, _ = wait(list(extracting) + list(translating), return_when=FIRST_COMPLETED)
+            for future in finished:
+                record = None
+
+                if future in extracting:
+                    path = extracting.pop(future)
+                    try:
+                        text = future.result()
+                    except BrokenProcessPool:
+                        # A worker died (e.g. OOM-killed); we cannot tell which
+                        # document caused it, so leave them all unrecorded
+                        pool_broken = True
+                        continue
+                    except Exception as e:
+                        logger.error(f"Extraction error for {path}: {e}")
+                        record = {'source': path, 'target_language': target_lang, 'status': 'failed', 'error': str(e)}
+                    else:
+                        if text.strip():
+                            output_path = output_path_for(path, base_dir, output_dir, target_lang)
+                            translating[translate_pool.submit(
+                                translate_document, path, text, output_path, target_lang, translator_class
+                            )] = path
+                        else:
+                            record = {
+                                'source': path,
+                                'target_language': target_lang,
+                                'status': 'empty',
+                                'error': 'No text could be extracted from the file',
+                            }
+                else:
+                    path = translating.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        logger.error(f"Translation error for {path}: {e}")
+                        record = {'source': path, 'target_language': target_lang, 'status': 'failed', 'error': str(e)}
+
+                if record is None:
+                    continue
+
+                report.write(json.dumps(record, ensure_ascii=False) + '\n')
+                report.flush()
+                counts[record['status']] += 1
+                chars += record.get('chars', 0)
+                done += 1
+
+                if time.time() - last_logged >= 1 or done == total:
+                    log_progress(done, total, chars, started)
+                    last_logged = time.time()
+
+    if pool_broken:
+        counts['unfinished'] = total - done
+        logger.error(f"Extraction pool stopped unexpectedly; {counts['unfinished']} documents left for the next run")
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Translate a directory tree of documents offline')
+    parser.add_argument('source', help='Directory to walk, or a manifest file with one path per line')
+    parser.add_argument('-o', '--output', required=True, help='Directory for translated text files')
+    parser.add_argument('-t', '--target', default='en', help='Target language code (default: en)')
+    parser.add_argument('--report', help='JSONL report path (default: <output>/report.jsonl)')
+    parser.add_argument('--backend', default='google',
+                        help="Translator backend: 'google', 'echo' or 'module:Class' (default: google)")
+    parser.add_argument('--workers', type=int, default=None, help='Extraction processes (default: CPU count)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent translations (default: 4)')
+    parser.add_argument('--no-resume', action='store_true', help='Reprocess documents already in the report')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    if not os.path.exists(args.source):
+        parser.error(f"Source not found: {args.source}")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    try:
+        translator_class = load_backend(args.backend)
+    except (ValueError, ImportError, AttributeError) as e:
+        parser.error(f"Could not load backend: {e}")
+
+    counts = run_batch(
+        args.source,
+        args.output,
+        args.target,
+        translator_class,
+        report_path=args.report,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        resume=not args.no_resume,
+    )
+    logger.info(f"Finished: {counts['ok']} translated, {counts['empty']} empty, {counts['failed']} failed, "
+                f"{counts['unfinished']} unfinished")
+    return 0 if counts['failed'] == 0 and counts['unfinished'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Document processing helpers for NLP Document Translator
+
+Text extraction, language detection and chunked translation shared by the
+Flask app and the offline batch CLI. Importing this module has no side
+effects beyond seeding langdetect.
+"""
+
+import logging
+
+# NLP Libraries
+from langdetect import detect, DetectorFactory
+from deep_translator import GoogleTranslator
+
+# Document Processing Libraries
+from docx import Document
+from pdfminer.high_level import extract_text
+import PyPDF2
+from openpyxl import load_workbook
+from pptx import Presentation
+
+# Set seed for consistent language detection
+DetectorFactory.seed = 0
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_EXTENSIONS = {'txt', 'pdf', 'docx', 'xlsx', 'pptx', 'doc'}
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+def extract_text_from_file(file_path, strict=False):
+    """Enhanced text extraction with better error handling.
+
+    With ``strict`` set, errors are raised instead of returning "" so callers
+    can tell a failed extraction from a blank document.
+    """
+    try:
+        with open(file_path, 'rb') as stream:
+            return extract_text_from_stream(stream, file_path, strict=strict)
+    except Exception as e:
+        if strict:
+            raise
+        logger.error(f"Text extraction error for {file_path}: {e}")
+        return ""
+
+def extract_text_from_stream(stream, filename, strict=False):
+    """Extract text from a seekable binary stream, using filename for the format"""
+    try:
+        file_extension = filename.lower().split('.')[-1]
+        
+        if file_extension == 'pdf':
+            # Try pdfminer first, fallback to PyPDF2
+            try:
+                text = extract_text(stream)
+                if not text.strip():
+                    stream.seek(0)
+                    pdf_reader = PyPDF2.PdfReader(stream)
+                    text = ""
+                    for page in pdf_reader.pages:
+                        text += page.extract_text()
+                return text
+            except Exception as e:
+                if strict:
+                    raise
+                logger.error(f"PDF extraction error: {e}")
+                return ""
+                
+        elif file_extension == 'docx':
+            doc = Document(stream)
+            text = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
+            # Also extract text from tables
+            for table in doc.tables:
+                for row in table.rows:
+                    for cell in row.cells:
+                        text += '\n' + cell.text
+            return text
+            
+        elif file_extension == 'xlsx':
+            workbook = load_workbook(stream)
+            text = ""
+            for sheet_name in workbook.sheetnames:
+                sheet = workbook[sheet_name]
+                for row in sheet.iter_rows(values_only=True):
+                    row_text = ' '.join([str(cell) for cell in row if cell is not None])
+                    if row_text.strip():
+                        text += row_text + '\n'
+            return text
+            
+        elif file_extension == 'pptx':
+            presentation = Presentation(stream)
+            text = ""
+            for slide in presentation.slides:
+                for shape in slide.shapes:
+                    if hasattr(shape, "text"):
+                        text += shape.text + '\n'
+            return text
+            
+        elif file_extension == 'txt':
+            data = stream.read()
+            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+            for encoding in encodings:
+                try:
+                    return data.decode(encoding)
+                except UnicodeDecodeError:
+                    continue
+            return ""
+            
+        else:
+            return ""
+            
+    except Exception as e:
+        if strict:
+            raise
+        logger.error(f"Text extraction error for {filename}: {e}")
+        return ""
+
+def detect_language_with_confidence(text):
+    """Enhanced language detection with confidence scoring"""
+    try:
+        if not text or len(text.strip()) < 10:
+            return 'en', 0.5
+            
+        # Clean text for better detection
+        clean_text = ' '.join(text.split()[:1000])  # Use first 1000 words
+        
+        detected_lang = detect(clean_text)
+        
+        # Simple confidence estimation based on text length and character patterns
+        confidence = min(0.9, 0.5 + (len(clean_text) / 1000) * 0.4)
+        
+        return detected_lang, confidence
+        
+    except Exception as e:
+        logger.error(f"Language detection error: {e}")
+        return 'en', 0.3
+
+def translate_text_chunked(text, src_lang, dest_lang, max_chunk_size=4500, translator_class=GoogleTranslator,
+                           strict=False):
+    """Translate text in chunks to handle large documents using deep-translator.
+
+    ``translator_class`` is any class taking ``source``/``target`` keyword
+    arguments and exposing ``translate(text)``; it defaults to Google.
+    With ``strict`` set, any failed chunk raises instead of being kept in the
+    source language.
+    """
+    try:
+        # Handle auto-detection
+        if src_lang == 'auto':
+            src_lang = detect(text)
+        
+        # Create translator instance
+        translator = translator_class(source=src_lang, target=dest_lang)
+        
+        if len(text) <= max_chunk_size:
+            return translator.translate(text)
+        
+        # Split text into chunks
+        chunks = []
+        sentences = text.split('. ')
+        current_chunk = ""
+        
+        for sentence in sentences:
+            if len(current_chunk + sentence) < max_chunk_size:
+                current_chunk += sentence + '. '
+            else:
+                if current_chunk:
+                    chunks.append(current_chunk.strip())
+                current_chunk = sentence + '. '
+        
+        if current_chunk:
+            chunks.append(current_chunk.strip())
+        
+        # Translate each chunk
+        translated_chunks = []
+        for chunk in chunks:
+            try:
+                translated_chunk = translator.translate(chunk)
+                translated_chunks.append(translated_chunk)
+            except Exception as e:
+                if strict:
+                    raise
+                logger.error(f"Translation error for chunk: {e}")
+                translated_chunks.append(chunk)  # Keep original if translation fails
+        
+        return ' '.join(translated_chunks)
+        
+    except Exception as e:
+        if strict:
+            raise
+        logger.error(f"Translation error: {e}")
+        return f"Translation failed: {str(e)}. Original text: {text[:200]}..."
@@ -118,6 +118,82 @@ def test_tts():
         print(f"✗ TTS test failed: {e}")
         return False
 
+def test_batch_translate():
+    """Test the offline batch CLI against a local stand-in backend"""
+    print("\nTesting batch translation...")
+    
+    try:
+        import json
+        import tempfile
+        from batch_translate import EchoTranslator, run_batch, main as batch_main
+        
+        class FlakyTranslator(EchoTranslator):
+            """Echo backend that fails like a rate-limited service on 'FAIL'"""
+            def translate(self, text):
+                if 'FAIL' in text:
+                    raise RuntimeError("429 Too Many Requests")
+                return text
+        
+        def read_report(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return [json.loads(line) for line in f]
+        
+        checks = []
+        with tempfile.TemporaryDirectory() as root:
+            src = os.path.join(root, 'src')
+            out = os.path.join(root, 'out')
+            os.makedirs(os.path.join(src, 'sub'))
+            documents = {
+                'ok.txt': 'This document should come through the batch run unchanged.',
+                os.path.join('sub', 'empty.txt'): '',
+                'fail.txt': 'FAIL. ' + 'Sentence to split into chunks. ' * 200,
+            }
+            for name, text in documents.items():
+                with open(os.path.join(src, name), 'w', encoding='utf-8') as f:
+                    f.write(text)
+            
+            counts = run_batch(src, out, 'es', FlakyTranslator, workers=1, concurrency=2)
+            checks.append(('first run statuses', counts == {'ok': 1, 'empty': 1, 'failed': 1, 'unfinished': 0}))
+            
+            output_path = os.path.join(out, 'ok.txt.es.txt')
+            checks.append(('output written', os.path.exists(output_path)))
+            checks.append(('failed output not written', not os.path.exists(os.path.join(out, 'fail.txt.es.txt'))))
+            
+            report_path = os.path.join(out, 'report.jsonl')
+            statuses = {os.path.basename(r['source']): r['status'] for r in read_report(report_path)}
+            checks.append(('report contents', statuses == {'ok.txt': 'ok', 'empty.txt': 'empty', 'fail.txt': 'failed'}))
+            
+            # Resume skips ok and empty documents but retries the failed one
+            counts = run_batch(src, out, 'es', FlakyTranslator, workers=1, concurrency=2)
+            checks.append(('resume retries failures only', counts == {'ok': 0, 'empty': 0, 'failed': 1, 'unfinished': 0}))
+            checks.append(('report appended', len(read_report(report_path)) == 4))
+            
+            # A new target language is not covered by the previous run
+            counts = run_batch(src, out, 'de', EchoTranslator, workers=1, concurrency=2)
+            checks.append(('new language translated', counts == {'ok': 2, 'empty': 1, 'failed': 0, 'unfinished': 0}))
+            
+            # Missing manifest entries fail and are retried, with a non-zero exit code
+            manifest = os.path.join(root, 'manifest.txt')
+            with open(manifest, 'w', encoding='utf-8') as f:
+                f.write('src/ok.txt\nmissing.txt\n')
+            manifest_out = os.path.join(root, 'manifest_out')
+            args = [manifest, '-o', manifest_out, '-t', 'es', '--backend', 'echo', '--workers', '1']
+            checks.append(('missing file exit code', batch_main(args) == 1))
+            checks.append(('missing file retried', batch_main(args) == 1))
+            statuses = [r['status'] for r in read_report(os.path.join(manifest_out, 'report.jsonl'))]
+            checks.append(('missing file reported as failed', statuses.count('failed') == 2 and statuses.count('ok') == 1))
+        
+        failed = [name for name, passed in checks if not passed]
+        if failed:
+            print(f"✗ Batch translation test failed: {', '.join(failed)}")
+            return False
+        
+        print(f"✓ Batch translation test: {len(checks)} checks passed")
+        return True
+    except Exception as e:
+        print(f"✗ Batch translation test failed: {e}")
+        return False
+
 def check_directories():
     """Check if required directories exist"""
     print("\nChecking directories...")
@@ -165,7 +241,7 @@ def main():
     
     # Run tests
     tests_passed = 0
-    total_tests = 6
+    total_tests = 7
     
     if test_imports():
         tests_passed += 1
@@ -179,6 +255,9 @@ def main():
     if test_tts():
         tests_passed += 1
     
+    if test_batch_translate():
+        tests_passed += 1
+    
     check_directories()
     
     if check_files():